@@ -18,6 +18,7 @@ from database.symbol import init_db as ensure_master_contract_tables_exists
 from database.apilog_db import init_db as ensure_api_log_tables_exists
 
 from utils.plugin_loader import load_broker_auth_functions
+from utils.json_provider import OrjsonProvider
 
 from dotenv import load_dotenv
 import os
@@ -27,6 +28,9 @@ def create_app():
     # Initialize Flask application
     app = Flask(__name__)
 
+    # Use orjson for parsing request bodies and serializing JSON responses
+    app.json = OrjsonProvider(app)
+
     # Initialize SocketIO
     socketio.init_app(app)  # Link SocketIO to the Flask app
 
@@ -40,6 +44,7 @@ def create_app():
     # Environment variables
     app.secret_key = os.getenv('APP_KEY')
     app.config['SQLALCHEMY_DATABASE_URI'] = os.getenv('DATABASE_URL')  # Adjust the environment variable name as necessary
+    app.config['SEND_FILE_MAX_AGE_DEFAULT'] = 300  # Let browsers reuse static assets for 5 minutes before revalidating
 
     # Initialize SQLAlchemy
  #   db.init_app(app)
@@ -60,9 +65,12 @@ def create_app():
     def not_found_error(error):
         return render_template('404.html'), 404
     
+    # The version does not change at runtime, so read it once
+    app_version = os.getenv('FLASK_APP_VERSION')
+
     @app.context_processor
     def inject_version():
-        return dict(version=os.getenv('FLASK_APP_VERSION'))
+        return dict(version=app_version)
 
     return app
 
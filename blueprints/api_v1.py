@@ -1,32 +1,51 @@
 from flask import Blueprint, request, jsonify, Response, session
 from database.auth_db import get_api_key, get_auth_token_broker
-from database.apilog_db import async_log_order, executor
+from database.apilog_db import async_log_order
 # Removed static import of broker-specific APIs
 from extensions import socketio  # Import SocketIO
 from limiter import limiter  # Import the limiter instance
-import copy
 import os
+import time
 from dotenv import load_dotenv
 import importlib  # Import importlib for dynamic imports
 
 load_dotenv()
 
 API_RATE_LIMIT = os.getenv("API_RATE_LIMIT", "10 per second")
-SMART_ORDER_DELAY = os.getenv("SMART_ORDER_DELAY", "0.5")
+SMART_ORDER_DELAY = float(os.getenv("SMART_ORDER_DELAY", "0.5"))
+
+# Mandatory request fields for each endpoint
+PLACE_ORDER_FIELDS = ('apikey', 'strategy', 'exchange', 'symbol', 'action', 'quantity')
+PLACE_SMART_ORDER_FIELDS = ('apikey', 'strategy', 'exchange', 'symbol', 'action', 'quantity', 'position_size')
+CLOSE_POSITION_FIELDS = ('apikey', 'strategy')
+CANCEL_ORDER_FIELDS = ('apikey', 'strategy', 'orderid')
+CANCEL_ALL_ORDER_FIELDS = ('apikey', 'strategy')
+MODIFY_ORDER_FIELDS = ('apikey', 'strategy', 'exchange', 'symbol', 'orderid', 'action', 'product', 'pricetype', 'price', 'quantity', 'disclosed_quantity', 'trigger_price')
 
 
 api_v1_bp = Blueprint('api_v1', __name__, url_prefix='/api/v1')
 
+# Imported broker order modules, keyed by broker name; failed imports are retried
+broker_module_cache = {}
+
 # Additional helper function for dynamic import
 def import_broker_module(broker_name):
+    if broker_name in broker_module_cache:
+        return broker_module_cache[broker_name]
+
     try:
         module_path = f'broker.{broker_name}.api.order_api'
         broker_module = importlib.import_module(module_path)
+        broker_module_cache[broker_name] = broker_module
         return broker_module
     except ImportError as error:
         print(f"Error importing {module_path}: {error}")
         return None
 
+def log_payload(data):
+    # Shallow copy without the apikey for logging; the payload values are flat scalars
+    return {key: value for key, value in data.items() if key != 'apikey'}
+
 @api_v1_bp.errorhandler(429)
 def ratelimit_handler(e):
     return jsonify(error="Rate limit exceeded"), 429
@@ -36,16 +55,17 @@ def ratelimit_handler(e):
 @limiter.limit(API_RATE_LIMIT)
 def place_order():
     try:
-        data = request.json
-        order_request_data = copy.deepcopy(data)
-        order_request_data.pop('apikey', None)
+        data = request.get_json(silent=True)
+        if not isinstance(data, dict):
+            return jsonify({'status': 'error', 'message': 'Invalid JSON payload'}), 400
 
-        mandatory_fields = ['apikey', 'strategy', 'exchange', 'symbol', 'action', 'quantity']
-        missing_fields = [field for field in mandatory_fields if field not in data]
+        missing_fields = [field for field in PLACE_ORDER_FIELDS if field not in data]
 
         if missing_fields:
             return jsonify({'status': 'error', 'message': f'Missing mandatory field(s): {", ".join(missing_fields)}'}), 400
 
+        order_request_data = log_payload(data)
+
         api_key = data['apikey']
         AUTH_TOKEN, broker = get_auth_token_broker(api_key)
         print(f'The connected broker is {broker}')
@@ -62,7 +82,7 @@ def place_order():
         if res.status == 200:
             socketio.emit('order_event', {'symbol': data['symbol'], 'action': data['action'], 'orderid': order_id})
             order_response_data = {'status': 'success', 'orderid': order_id}
-            executor.submit(async_log_order, 'placeorder', order_request_data, order_response_data) # Assuming executor exists and is configured
+            async_log_order('placeorder', order_request_data, order_response_data)
             return jsonify(order_response_data)
         else:
             message = response_data.get('message', 'Failed to place order')
@@ -79,16 +99,17 @@ def place_order():
 @limiter.limit(API_RATE_LIMIT)
 def place_smart_order():
     try:
-        data = request.json
-        order_request_data = copy.deepcopy(data)
-        order_request_data.pop('apikey', None)
+        data = request.get_json(silent=True)
+        if not isinstance(data, dict):
+            return jsonify({'status': 'error', 'message': 'Invalid JSON payload'}), 400
 
-        mandatory_fields = ['apikey', 'strategy', 'exchange', 'symbol', 'action', 'quantity', 'position_size']
-        missing_fields = [field for field in mandatory_fields if field not in data]
+        missing_fields = [field for field in PLACE_SMART_ORDER_FIELDS if field not in data]
 
         if missing_fields:
             return jsonify({'status': 'error', 'message': f'Missing mandatory field(s): {", ".join(missing_fields)}'}), 400
 
+        order_request_data = log_payload(data)
+
         api_key = data['apikey']
         AUTH_TOKEN, broker = get_auth_token_broker(api_key)
 
@@ -107,13 +128,12 @@ def place_smart_order():
 
         
 
-        import time
-        time.sleep(float(SMART_ORDER_DELAY))
+        time.sleep(SMART_ORDER_DELAY)
 
         if res and res.status == 200:
             socketio.emit('order_event', {'symbol': data['symbol'], 'action': data['action'], 'orderid': order_id})
             order_response_data = {'status': 'success', 'orderid': order_id}
-            executor.submit(async_log_order, 'placesmartorder', order_request_data, order_response_data) # Assuming executor exists and is configured
+            async_log_order('placesmartorder', order_request_data, order_response_data)
             return jsonify(order_response_data)
         else:
             message = response_data.get('message', 'Failed to place smart order')
@@ -132,16 +152,17 @@ def place_smart_order():
 @limiter.limit(API_RATE_LIMIT)
 def close_position():
     try:
-        data = request.json
-        sqoff_request_data = copy.deepcopy(data)
-        sqoff_request_data.pop('apikey', None)
+        data = request.get_json(silent=True)
+        if not isinstance(data, dict):
+            return jsonify({'status': 'error', 'message': 'Invalid JSON payload'}), 400
 
-        mandatory_fields = ['apikey', 'strategy']
-        missing_fields = [field for field in mandatory_fields if field not in data]
+        missing_fields = [field for field in CLOSE_POSITION_FIELDS if field not in data]
 
         if missing_fields:
             return jsonify({'status': 'error', 'message': f'Missing mandatory field(s): {", ".join(missing_fields)}'}), 400
 
+        sqoff_request_data = log_payload(data)
+
         api_key = data['apikey']
         AUTH_TOKEN, broker = get_auth_token_broker(api_key)
 
@@ -157,8 +178,8 @@ def close_position():
 
         socketio.emit('close_position', {'status': 'success', 'message': 'All Open Positions Squared Off'})
         
-        # Assuming executor and async_log_order are properly defined and set up
-        executor.submit(async_log_order, 'squareoff', sqoff_request_data, "All Open Positions Squared Off")
+        # Queue the order log for the background log writer
+        async_log_order('squareoff', sqoff_request_data, "All Open Positions Squared Off")
 
         return jsonify(response_code), status_code
 
@@ -175,16 +196,17 @@ def close_position():
 @limiter.limit(API_RATE_LIMIT)
 def cancel_order_route():
     try:
-        data = request.json
-        order_request_data = copy.deepcopy(data)
-        order_request_data.pop('apikey', None)
+        data = request.get_json(silent=True)
+        if not isinstance(data, dict):
+            return jsonify({'status': 'error', 'message': 'Invalid JSON payload'}), 400
 
-        mandatory_fields = ['apikey', 'strategy', 'orderid']
-        missing_fields = [field for field in mandatory_fields if field not in data]
+        missing_fields = [field for field in CANCEL_ORDER_FIELDS if field not in data]
 
         if missing_fields:
             return jsonify({'status': 'error', 'message': f'Missing mandatory field(s): {", ".join(missing_fields)}'}), 400
 
+        order_request_data = log_payload(data)
+
         api_key = data['apikey']
         AUTH_TOKEN, broker = get_auth_token_broker(api_key)
 
@@ -200,8 +222,8 @@ def cancel_order_route():
 
         socketio.emit('cancel_order_event', {'status': response_message['status'], 'orderid': data['orderid']})
         
-        # Assuming executor and async_log_order are properly defined and set up
-        executor.submit(async_log_order, 'cancelorder', order_request_data, response_message)
+        # Queue the order log for the background log writer
+        async_log_order('cancelorder', order_request_data, response_message)
 
         return jsonify(response_message), status_code
 
@@ -219,16 +241,17 @@ def cancel_order_route():
 @limiter.limit(API_RATE_LIMIT)
 def cancel_all_orders():
     try:
-        data = request.json
-        order_request_data = copy.deepcopy(data)
-        order_request_data.pop('apikey', None)
+        data = request.get_json(silent=True)
+        if not isinstance(data, dict):
+            return jsonify({'status': 'error', 'message': 'Invalid JSON payload'}), 400
 
-        mandatory_fields = ['apikey', 'strategy']
-        missing_fields = [field for field in mandatory_fields if field not in data]
+        missing_fields = [field for field in CANCEL_ALL_ORDER_FIELDS if field not in data]
 
         if missing_fields:
             return jsonify({'status': 'error', 'message': f'Missing mandatory field(s): {", ".join(missing_fields)}'}), 400
 
+        order_request_data = log_payload(data)
+
         api_key = data['apikey']
         AUTH_TOKEN, broker = get_auth_token_broker(api_key)
 
@@ -246,12 +269,11 @@ def cancel_all_orders():
         for orderid in canceled_orders:
             socketio.emit('cancel_order_event', {'status': 'success', 'orderid': orderid})
         
-        # Assuming executor and async_log_order are properly defined and set up
-        executor.submit(async_log_order, 'cancelallorder', order_request_data, "Cancel All Order Initiated")
+        # Queue the order log for the background log writer
+        async_log_order('cancelallorder', order_request_data, "Cancel All Order Initiated")
         # Optionally, emit events for failed cancellations
 
-        # Assuming executor and async_log_order are properly defined and set up
-        # executor.submit(async_log_order, 'cancelallorder', order_request_data, {
+        # async_log_order('cancelallorder', order_request_data, {
         #     'canceled_orders': canceled_orders,
         #     'failed_cancellations': failed_cancellations
         # })
@@ -275,16 +297,17 @@ def cancel_all_orders():
 @limiter.limit(API_RATE_LIMIT)
 def modify_order_route():
     try:
-        data = request.json
-        order_request_data = copy.deepcopy(data)
-        order_request_data.pop('apikey', None)
+        data = request.get_json(silent=True)
+        if not isinstance(data, dict):
+            return jsonify({'status': 'error', 'message': 'Invalid JSON payload'}), 400
 
-        mandatory_fields = ['apikey', 'strategy', 'exchange', 'symbol', 'orderid', 'action', 'product', 'pricetype', 'price', 'quantity', 'disclosed_quantity', 'trigger_price']
-        missing_fields = [field for field in mandatory_fields if field not in data]
+        missing_fields = [field for field in MODIFY_ORDER_FIELDS if field not in data]
 
         if missing_fields:
             return jsonify({'status': 'error', 'message': f'Missing mandatory field(s): {", ".join(missing_fields)}'}), 400
 
+        order_request_data = log_payload(data)
+
         api_key = data['apikey']
         AUTH_TOKEN, broker = get_auth_token_broker(api_key)
 
@@ -300,8 +323,8 @@ def modify_order_route():
 
         socketio.emit('modify_order_event', {'status': response_message['status'], 'orderid': data['orderid']})
         
-        # Assuming executor and async_log_order are properly defined and set up
-        executor.submit(async_log_order, 'modifyorder', order_request_data, response_message)
+        # Queue the order log for the background log writer
+        async_log_order('modifyorder', order_request_data, response_message)
 
         return jsonify(response_message), status_code
 
@@ -24,7 +24,8 @@ def manage_api_key():
         # Placeholder for fetching the user's current API key if needed
         return render_template('apikey.html', login_username=login_username,api_key=current_api_key)
     else:
-        user_id = request.json.get('user_id')
+        data = request.get_json(silent=True)
+        user_id = data.get('user_id') if isinstance(data, dict) else None
         if not user_id:
             return jsonify({'error': 'User ID is required'}), 400
         
@@ -12,6 +12,9 @@ load_dotenv()
 # Access environment variables
 LOGIN_RATE_LIMIT_MIN = os.getenv("LOGIN_RATE_LIMIT_MIN", "5 per minute")
 LOGIN_RATE_LIMIT_HOUR = os.getenv("LOGIN_RATE_LIMIT_HOUR", "25 per hour")
+BROKER_API_KEY = os.getenv('BROKER_API_KEY')
+BROKER_API_SECRET = os.getenv('BROKER_API_SECRET')
+REDIRECT_URL = os.getenv('REDIRECT_URL')
 
 auth_bp = Blueprint('auth', __name__, url_prefix='/auth')
 
@@ -56,11 +59,7 @@ def broker_login():
         return redirect(url_for('dashboard_bp.dashboard'))
     if request.method == 'GET':
         if 'user' not in session:
-            # Environment variables
             return redirect(url_for('auth.login'))
-        BROKER_API_KEY = os.getenv('BROKER_API_KEY')
-        BROKER_API_SECRET = os.getenv('BROKER_API_SECRET')
-        REDIRECT_URL = os.getenv('REDIRECT_URL')
         return render_template('broker.html', broker_api_key=BROKER_API_KEY, broker_api_secret=BROKER_API_SECRET,
                                redirect_url=REDIRECT_URL)
 
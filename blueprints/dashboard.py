@@ -5,7 +5,12 @@ from database.auth_db import get_auth_token
 from importlib import import_module
 
 
+# Resolved get_margin_data functions, keyed by broker
+margin_function_cache = {}
+
 def dynamic_import(broker):
+    if broker in margin_function_cache:
+        return margin_function_cache[broker]
     try:
         # Construct module path dynamically
         module_path = f'broker.{broker}.api.funds'
@@ -13,6 +18,7 @@ def dynamic_import(broker):
         module = import_module(module_path)
         # Now, you can access get_margin_data or any other function directly
         get_margin_data = getattr(module, 'get_margin_data')
+        margin_function_cache[broker] = get_margin_data
         return get_margin_data
     except ImportError as e:
         # Handle the error if module doesn't exist
@@ -2,9 +2,8 @@
 
 from flask import Blueprint, render_template, session, redirect, url_for
 from database.apilog_db import OrderLog
-from sqlalchemy import func
 import pytz
-from datetime import datetime
+from datetime import datetime, timedelta
 
 log_bp = Blueprint('log_bp', __name__, url_prefix='/logs')
 
@@ -16,10 +15,15 @@ def view_logs():
     # Set timezone to IST
     ist = pytz.timezone('Asia/Kolkata')
     
-    # Get the current date in IST
-    today_ist = datetime.now(ist).date()
+    # Get the start of the current day in IST
+    start_of_day_ist = datetime.now(ist).replace(hour=0, minute=0, second=0, microsecond=0)
+    end_of_day_ist = start_of_day_ist + timedelta(days=1)
 
-    # Filter logs by today's date in IST
-    logs = OrderLog.query.filter(func.date(OrderLog.created_at) == today_ist).order_by(OrderLog.created_at.desc()).all()
+    # Filter logs by today's date in IST as a plain range on created_at,
+    # so the database compares the column directly instead of calling date() on every row
+    logs = OrderLog.query.filter(
+        OrderLog.created_at >= start_of_day_ist,
+        OrderLog.created_at < end_of_day_ist
+    ).order_by(OrderLog.created_at.desc()).all()
 
-    return render_template('logs.html', logs=logs)
\ No newline at end of file
+    return render_template('logs.html', logs=logs)
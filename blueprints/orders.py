@@ -5,13 +5,21 @@ from database.auth_db import get_auth_token
 # Define the blueprint
 orders_bp = Blueprint('orders_bp', __name__, url_prefix='/')
 
+# Resolved broker functions, keyed by broker, module and function names
+broker_functions_cache = {}
+
 def dynamic_import(broker, module_name, function_names):
+    cache_key = (broker, module_name, tuple(function_names))
+    if cache_key in broker_functions_cache:
+        return broker_functions_cache[cache_key]
+
     module_functions = {}
     try:
         # Import the module based on the broker name
         module = import_module(f'broker.{broker}.{module_name}')
         for name in function_names:
             module_functions[name] = getattr(module, name)
+        broker_functions_cache[cache_key] = module_functions
         return module_functions
     except (ImportError, AttributeError) as e:
         print(f"Error importing functions {function_names} from {module_name} for broker {broker}: {e}")
@@ -20,9 +20,12 @@ def tradingview_json():
         return redirect(url_for('auth_bp.login'))
     
     if request.method == 'POST':
-        symbol_input = request.json.get('symbol')  # Changed to request.json to get data from JSON payload
-        exchange = request.json.get('exchange')
-        product = request.json.get('product')
+        data = request.get_json(silent=True)  # Parse the JSON payload once
+        if not isinstance(data, dict):
+            return jsonify({'error': 'Symbol not found'}), 404
+        symbol_input = data.get('symbol')
+        exchange = data.get('exchange')
+        product = data.get('product')
         api_key = get_api_key(session.get('user'))  # Make sure 'user_id' is correctly set in session
         
         broker = session['broker']
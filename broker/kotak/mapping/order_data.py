@@ -2,6 +2,53 @@ import json
 from database.token_db import get_symbol, get_oa_symbol
 from broker.kotak.mapping.transform_data import map_exchange 
 
+# Kotak price type and transaction type codes mapped to OpenAlgo values
+PRICE_TYPE_MAP = {
+    "MKT": "MARKET",
+    "L": "LIMIT",
+    "SL": "SL",
+    "SL-M": "SL-M"
+}
+
+TRANSACTION_TYPE_MAP = {
+    "B": "BUY",
+    "S": "SELL"
+}
+
+# Response status values that mean the order/trade book request failed
+ERROR_STATUSES = frozenset({"not_ok", "notok", "error"})
+
+def map_symbols(rows, map_action=False):
+    """
+    Normalizes the exchange and replaces the trading symbol of each order or trade row
+    with the OpenAlgo symbol from the database.
+
+    Parameters:
+    - rows: A list of dictionaries, where each dictionary represents an order or trade.
+    - map_action: If True, also maps the transaction type (B/S) for rows with a known symbol.
+    """
+    # Rows often repeat the same instrument, so look up each token only once per call
+    symbol_cache = {}
+    for row in rows:
+        # Extract the instrument_token and exchange for the current row
+        symboltoken = row['tok']
+        exchange = map_exchange(row['exSeg'])
+        row['exSeg'] = exchange
+
+        # Use the get_symbol function to fetch the symbol from the database
+        cache_key = (symboltoken, exchange)
+        if cache_key not in symbol_cache:
+            symbol_cache[cache_key] = get_symbol(symboltoken, exchange)
+        symbol_from_db = symbol_cache[cache_key]
+
+        # Check if a symbol was found; if so, update the trading_symbol in the current row
+        if symbol_from_db:
+            row['trdSym'] = symbol_from_db
+            if map_action:
+                row['trnsTp'] = TRANSACTION_TYPE_MAP.get(row['trnsTp'], row['trnsTp'])
+        else:
+            print(f"Symbol not found for token {symboltoken} and exchange {exchange}. Keeping original trading symbol.")
+
 def map_order_data(order_data):
     """
     Processes and modifies a list of order dictionaries based on specific conditions.
@@ -16,7 +63,7 @@ def map_order_data(order_data):
     #if order_data has key 'data' and its value is None
     
     
-    if order_data['stat'] == 'Not_Ok':
+    if (order_data.get('stat') or '').lower() in ERROR_STATUSES:
         print("No data available.")
         order_data = {}  # or set it to an empty list if it's supposed to be a list
         return order_data
@@ -33,21 +80,7 @@ def map_order_data(order_data):
 
 
     if order_data:
-        for order in order_data:
-            # Extract the instrument_token and exchange for the current order
-            symboltoken = order['tok']
-            exchange = map_exchange(order['exSeg'])
-            order['exSeg'] = exchange
-            
-            
-            # Use the get_symbol function to fetch the symbol from the database
-            symbol_from_db = get_symbol(symboltoken, exchange)
-            
-            # Check if a symbol was found; if so, update the trading_symbol in the current order
-            if symbol_from_db:
-                order['trdSym'] = symbol_from_db
-            else:
-                print(f"Symbol not found for token {symboltoken} and exchange {exchange}. Keeping original trading symbol.")         
+        map_symbols(order_data)
     return order_data
 
 
@@ -71,11 +104,11 @@ def calculate_order_statistics(order_data):
     if order_data:
         for order in order_data:
             # Count buy and sell orders
-            if order['trnsTp'] == 'B':
-                order['trnsTp'] = 'BUY'
+            action = TRANSACTION_TYPE_MAP.get(order['trnsTp'], order['trnsTp'])
+            order['trnsTp'] = action
+            if action == 'BUY':
                 total_buy_orders += 1
-            elif order['trnsTp'] == 'S':
-                order['trnsTp'] = 'SELL'
+            elif action == 'SELL':
                 total_sell_orders += 1
             
             # Count orders based on their status
@@ -109,14 +142,9 @@ def transform_order_data(orders):
         if not isinstance(order, dict):
             print(f"Warning: Expected a dict, but found a {type(order)}. Skipping this item.")
             continue
-        if order.get('prcTp') == 'MKT':
-            order['prcTp'] = 'MARKET'
-        elif order.get('prcTp') == 'L':
-            order['prcTp'] = 'LIMIT'
-        elif order.get('prcTp') == 'SL':
-            order['prcTp'] = 'SL'
-        elif order.get('prcTp') == 'SL-M':
-            order['prcTp'] = 'SL-M'
+        price_type = order.get('prcTp')
+        if price_type in PRICE_TYPE_MAP:
+            order['prcTp'] = PRICE_TYPE_MAP[price_type]
         
         transformed_order = {
             "symbol": order.get("trdSym", ""),
@@ -148,7 +176,7 @@ def map_trade_data(trade_data):
     Returns:
     - The modified order_data with updated 'tradingsymbol' and 'product' fields.
     """
-    if trade_data['stat'] == 'Not_Ok':
+    if (trade_data.get('stat') or '').lower() in ERROR_STATUSES:
         print("No data available.")
         trade_data = {}  # or set it to an empty list if it's supposed to be a list
         return trade_data
@@ -165,27 +193,7 @@ def map_trade_data(trade_data):
 
 
     if trade_data:
-        for order in trade_data:
-            # Extract the instrument_token and exchange for the current order
-            symbol = order['tok']
-            exchange = map_exchange(order['exSeg'])
-            order['exSeg'] = exchange
-            print(symbol)
-            print(exchange)
-            # Use the get_symbol function to fetch the symbol from the database
-            symbol_from_db = get_symbol(symbol, exchange)
-            print(symbol_from_db)
-            # Check if a symbol was found; if so, update the trading_symbol in the current order
-            if symbol_from_db:
-                order['trdSym'] = symbol_from_db
-                if order['trnsTp'] == 'B':
-                    order['trnsTp'] = 'BUY'
-                elif order['trnsTp'] == 'S':
-                    order['trnsTp'] = 'SELL'
-                    
-            else:
-                print(f"Unable to find the symbol {symbol} and exchange {exchange}. Keeping original trading symbol.")
-    print(trade_data)           
+        map_symbols(trade_data, map_action=True)
     return trade_data
 
 
@@ -195,14 +203,17 @@ def transform_tradebook_data(tradebook_data):
     transformed_data = []
     
     for trade in tradebook_data:
+        # Read quantity and price once since they are also used for the trade value
+        quantity = trade.get('fldQty', 0)
+        average_price = trade.get('avgPrc', 0.0)
         transformed_trade = {
             "symbol": trade.get('trdSym', ''),
             "exchange": trade.get('exSeg', ''),
             "product": trade.get('prod', ''),
             "action": trade.get('trnsTp', ''),
-            "quantity": trade.get('fldQty', 0),
-            "average_price": trade.get('avgPrc', 0.0),
-            "trade_value": float(trade.get('fldQty', 0.0))*float(trade.get('avgPrc', 0.0)),
+            "quantity": quantity,
+            "average_price": average_price,
+            "trade_value": float(quantity)*float(average_price),
             "orderid": trade.get('nOrdNo', ''),
             "timestamp": trade.get('exTm', '')
         }
@@ -217,31 +228,41 @@ def map_position_data(position_data):
 def transform_positions_data(positions_data):
     transformed_data = []
     for position in positions_data:
+        # Parse the day and carry-forward quantities once and reuse them below
+        fl_buy_qty = int(position.get('flBuyQty', 0))
+        fl_sell_qty = int(position.get('flSellQty', 0))
+        net_quantity = (fl_buy_qty - fl_sell_qty) + (int(position.get('cfBuyQty', 0)) - int(position.get('cfSellQty', 0)))
+
+        average_price = position.get('avgnetprice', 0.0)
+        if net_quantity > 0 and fl_buy_qty:
+            average_price = round(float(position['buyAmt']) / fl_buy_qty, 2)
+        elif net_quantity < 0 and fl_sell_qty:
+            average_price = round(float(position['sellAmt']) / fl_sell_qty, 2)
+
         transformed_position = {
             "symbol": position.get('trdSym', ''),
             "exchange": position.get('exSeg', ''),
             "product": position.get('prod', ''),
-            "quantity": (int(position.get('flBuyQty', 0)) - int(position.get('flSellQty', 0)))+(int(position.get('cfBuyQty', 0)) - int(position.get('cfSellQty', 0))),
-            "average_price": position.get('avgnetprice', 0.0),
+            "quantity": net_quantity,
+            "average_price": average_price,
         }
-        if transformed_position['quantity'] > 0:
-            transformed_position["average_price"] = round(float(position['buyAmt'])/float(position['flBuyQty']),2)
-        elif transformed_position['quantity'] < 0:
-            transformed_position["average_price"] = round(float(position['sellAmt'])/float(position['flSellQty']),2)
-            
         transformed_data.append(transformed_position)
     return transformed_data
 
 def transform_holdings_data(holdings_data):
     transformed_data = []
     for holding in holdings_data:
+        # Parse the market value and cost once and derive both P&L figures from them
+        market_value = float(holding.get('mktValue', 0.0))
+        holding_cost = float(holding.get('holdingCost', 0.0))
+        pnl = market_value - holding_cost
         transformed_position = {
             "symbol": holding.get('symbol', ''),
             "exchange": holding.get('exchangeSegment', ''),
             "quantity": holding.get('quantity', 0),
             "product": holding.get('instrumentType', ''),
-            "pnl": round((float(holding.get('mktValue', 0.0)) - float(holding.get('holdingCost', 0.0))),2),
-            "pnlpercent": round((float(holding.get('mktValue', 0.0)) - float(holding.get('holdingCost', 0.0)))/float(holding.get('holdingCost', 0.0))*100,2)
+            "pnl": round(pnl, 2),
+            "pnlpercent": round(pnl / holding_cost * 100, 2) if holding_cost else 0
         }
         transformed_data.append(transformed_position)
     return transformed_data
@@ -269,12 +290,16 @@ def map_portfolio_data(portfolio_data):
 
     # Modify 'product' field for each holding if applicable
     
+    symbol_cache = {}
     for portfolio in holdings:
         token = portfolio['instrumentToken']
         
         exchange = map_exchange(portfolio['exchangeSegment'])
         portfolio['exchangeSegment'] = exchange
-        symbol_from_db = get_symbol(token, exchange)
+        cache_key = (token, exchange)
+        if cache_key not in symbol_cache:
+            symbol_cache[cache_key] = get_symbol(token, exchange)
+        symbol_from_db = symbol_cache[cache_key]
             
             # Check if a symbol was found; if so, update the trading_symbol in the current order
         if symbol_from_db:
@@ -292,14 +317,20 @@ def map_portfolio_data(portfolio_data):
 
 def calculate_portfolio_statistics(holdings_data):
     
-    totalholdingvalue = sum(item['mktValue'] for item in holdings_data)
-    totalinvvalue = sum(item['holdingCost'] for item in holdings_data)
-    totalprofitandloss = sum(item['mktValue'] - item['holdingCost'] for item in holdings_data)
-    
-    totalpnlpercentage = sum((item['mktValue'] - item['holdingCost']) / item['holdingCost'] * 100 for item in holdings_data)
-    
+    totalholdingvalue = totalinvvalue = totalprofitandloss = totalpnlpercentage = 0
+
+    # Accumulate all totals in a single pass over the holdings
+    for item in holdings_data:
+        market_value = item['mktValue']
+        holding_cost = item['holdingCost']
+        pnl = market_value - holding_cost
+        totalholdingvalue += market_value
+        totalinvvalue += holding_cost
+        totalprofitandloss += pnl
+        # To avoid division by zero when a holding has no investment value
+        if holding_cost:
+            totalpnlpercentage += pnl / holding_cost * 100
     
-    # To avoid division by zero in the case when total_investment_value is 0
     totalpnlpercentage = round(totalpnlpercentage, 2)
     
     
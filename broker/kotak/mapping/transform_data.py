@@ -51,84 +51,81 @@ def transform_modify_order_data(data, token):
 
 
 
+# OpenAlgo <-> Kotak code tables, built once at import instead of on every call
+ORDER_TYPE_MAPPING = {
+    "MARKET": "MKT",
+    "LIMIT": "L",
+    "SL": "SL",
+    "SL-M": "SL-M"
+}
+
+PRODUCT_TYPE_MAPPING = {
+    "CNC": "CNC",
+    "NRML": "NRML",
+    "MIS": "MIS",
+}
+
+VARIETY_MAPPING = {
+    "MARKET": "NORMAL",
+    "LIMIT": "NORMAL",
+    "SL": "STOPLOSS",
+    "SL-M": "STOPLOSS"
+}
+
+EXCHANGE_MAPPING = {
+    "nse_cm": "NSE",
+    "bse_cm": "BSE",
+    "cde_fo": "CDS",
+    "nse_fo": "NFO",
+    "bse_fo": "BFO",
+    "bcs_fo": "BCD",
+    "mcx_fo": "MCX"
+}
+
+REVERSE_EXCHANGE_MAPPING = {
+    "NSE": "nse_cm",
+    "BSE": "bse_cm",
+    "CDS": "cde_fo",
+    "NFO": "nse_fo",
+    "BFO": "bse_fo",
+    "BCD": "bcs_fo",
+    "MCX": "mcx_fo"
+}
+
 def map_order_type(pricetype):
     """
     Maps the new pricetype to the existing order type.
     """
-    order_type_mapping = {
-        "MARKET": "MKT",
-        "LIMIT": "L",
-        "SL": "SL",
-        "SL-M": "SL-M"
-    }
-    return order_type_mapping.get(pricetype, "MARKET")  # Default to MARKET if not found
+    return ORDER_TYPE_MAPPING.get(pricetype, "MARKET")  # Default to MARKET if not found
 
 def map_product_type(product):
     """
     Maps the new product type to the existing product type.
     """
-    product_type_mapping = {
-        "CNC": "CNC",
-        "NRML": "NRML",
-        "MIS": "MIS",
-    }
-    return product_type_mapping.get(product)  # Default to DELIVERY if not found
+    return PRODUCT_TYPE_MAPPING.get(product)  # Default to DELIVERY if not found
 
 
 def map_variety(pricetype):
     """
     Maps the pricetype to the existing order variety.
     """
-    variety_mapping = {
-        "MARKET": "NORMAL",
-        "LIMIT": "NORMAL",
-        "SL": "STOPLOSS",
-        "SL-M": "STOPLOSS"
-    }
-    return variety_mapping.get(pricetype, "NORMAL")  # Default to DELIVERY if not found
+    return VARIETY_MAPPING.get(pricetype, "NORMAL")  # Default to DELIVERY if not found
 
 def map_exchange(brexchange):
     """
     Maps the Broker Exchange to the OpenAlgo Exchange.
     """
-    
-
-    exchange_mapping = {
-        "nse_cm": "NSE",
-        "bse_cm": "BSE",
-        "cde_fo": "CDS",
-        "nse_fo": "NFO",
-        "bse_fo": "BFO",
-        "bcs_fo": "BCD",
-        "mcx_fo": "MCX"
-
-    }
-    return exchange_mapping.get(brexchange)
+    return EXCHANGE_MAPPING.get(brexchange)
 
 def reverse_map_exchange(exchange):
     """
     Maps the Broker Exchange to the OpenAlgo Exchange.
     """
-
-    exchange_mapping = {
-        "NSE": "nse_cm",
-        "BSE": "bse_cm",
-        "CDS": "cde_fo",
-        "NFO": "nse_fo",
-        "BFO": "bse_fo",
-        "BCD": "bcs_fo",
-        "MCX": "mcx_fo"
-    }
-    return exchange_mapping.get(exchange)
+    return REVERSE_EXCHANGE_MAPPING.get(exchange)
 
 def reverse_map_product_type(product):
     """
     Maps the new product type to the existing product type.
     """
-    reverse_product_type_mapping = {
-        "CNC": "CNC",
-        "NRML": "NRML",
-        "MIS": "MIS",
-    }
-    return reverse_product_type_mapping.get(product)  
+    return PRODUCT_TYPE_MAPPING.get(product)
 
@@ -0,0 +1,18 @@
+# database/__init__.py
+
+import sqlite3
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+
+@event.listens_for(Engine, "connect")
+def set_sqlite_pragma(dbapi_connection, connection_record):
+    """
+    Switch SQLite connections to WAL with NORMAL sync so readers do not block
+    on writers and each commit avoids the extra fsync of the rollback journal.
+    """
+    if isinstance(dbapi_connection, sqlite3.Connection):
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute("PRAGMA synchronous=NORMAL")
+        cursor.close()
@@ -6,7 +6,9 @@ from sqlalchemy import create_engine, Column, Integer, DateTime, Text
 from sqlalchemy.orm import scoped_session, sessionmaker
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.sql import func
-from concurrent.futures import ThreadPoolExecutor
+from threading import Thread
+import queue
+import atexit
 from dotenv import load_dotenv
 from datetime import datetime
 import pytz
@@ -33,16 +35,26 @@ class OrderLog(Base):
     api_type = Column(Text, nullable=False)
     request_data = Column(Text, nullable=False)
     response_data = Column(Text, nullable=False)
-    created_at = Column(DateTime(timezone=True), default=func.now())
+    created_at = Column(DateTime(timezone=True), default=func.now(), index=True)
 
 def init_db():
     print("Initializing API Log DB")
     Base.metadata.create_all(bind=engine)
+    # create_all skips indexes on tables that already exist, so add any missing ones
+    for index in OrderLog.__table__.indexes:
+        index.create(bind=engine, checkfirst=True)
 
 
 
-# Executor for asynchronous tasks
-executor = ThreadPoolExecutor(2)
+# Order logs are queued by the API handlers and written in batches by a single
+# background thread, so a request only pays for a queue put instead of a commit
+LOG_QUEUE_MAXSIZE = 10000
+LOG_BATCH_SIZE = 100
+LOG_BATCH_WAIT = 0.05  # Seconds to wait for more logs before committing a batch
+LOG_STOP_TIMEOUT = 5  # Seconds to wait for the writer to stop at exit
+LOG_STOP = object()  # Queued at exit to tell the writer to finish its batch and stop
+
+log_queue = queue.Queue(maxsize=LOG_QUEUE_MAXSIZE)
 
 def async_log_order(api_type,request_data, response_data):
     try:
@@ -54,11 +66,75 @@ def async_log_order(api_type,request_data, response_data):
         ist = pytz.timezone('Asia/Kolkata')
         now_ist = datetime.now(ist)
 
-        order_log = OrderLog(api_type=api_type,request_data=request_json, response_data=response_json, created_at=now_ist)
-        db_session.add(order_log)
+        log_queue.put_nowait({
+            'api_type': api_type,
+            'request_data': request_json,
+            'response_data': response_json,
+            'created_at': now_ist
+        })
+    except queue.Full:
+        print(f"Order log queue is full, dropping {api_type} log")
+    except Exception as e:
+        print(f"Error queuing order log: {e}")
+
+def write_order_logs(batch):
+    try:
+        # One executemany INSERT for the whole batch instead of an ORM object per row
+        db_session.execute(OrderLog.__table__.insert(), batch)
         db_session.commit()
     except Exception as e:
-        print(f"Error saving order log: {e}")
+        db_session.rollback()
+        print(f"Error saving order logs: {e}")
     finally:
         db_session.remove()
 
+def drain_log_queue():
+    batch = []
+    while True:
+        try:
+            item = log_queue.get_nowait()
+        except queue.Empty:
+            break
+        if item is not LOG_STOP:
+            batch.append(item)
+    return batch
+
+def order_log_writer():
+    while True:
+        # Block for the first log, then collect whatever else arrives shortly after
+        item = log_queue.get()
+        if item is LOG_STOP:
+            return
+        batch = [item]
+        stopping = False
+        while len(batch) < LOG_BATCH_SIZE:
+            try:
+                item = log_queue.get(timeout=LOG_BATCH_WAIT)
+            except queue.Empty:
+                break
+            if item is LOG_STOP:
+                stopping = True
+                break
+            batch.append(item)
+        write_order_logs(batch)
+        if stopping:
+            return
+
+def flush_order_logs():
+    # Let the writer finish the batch it is holding before draining the rest at exit
+    try:
+        log_queue.put(LOG_STOP, timeout=LOG_STOP_TIMEOUT)
+    except queue.Full:
+        print("Order log queue is full, could not stop the writer for the final flush")
+        return
+    log_writer_thread.join(timeout=LOG_STOP_TIMEOUT)
+    if log_writer_thread.is_alive():
+        print("Order log writer did not stop in time, skipping the final flush")
+        return
+    batch = drain_log_queue()
+    if batch:
+        write_order_logs(batch)
+
+log_writer_thread = Thread(target=order_log_writer, daemon=True)
+log_writer_thread.start()
+atexit.register(flush_order_logs)
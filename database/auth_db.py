@@ -14,6 +14,8 @@ from cachetools import TTLCache
 # Define a cache for the auth tokens and api_key with a max size and a 30-second TTL
 auth_cache = TTLCache(maxsize=1024, ttl=30)
 api_key_cache = TTLCache(maxsize=1024, ttl=30)
+# Cache the (auth token, broker) pair per provided API key so order APIs skip the DB lookups
+broker_cache = TTLCache(maxsize=1024, ttl=30)
 
 load_dotenv()
 
@@ -61,6 +63,8 @@ def upsert_auth(name, auth_token, broker, revoke=False):
         auth_obj = Auth(name=name, auth=auth_token, broker=broker, is_revoked=revoke)
         db_session.add(auth_obj)
     db_session.commit()
+    # Drop cached broker lookups so a new or revoked token is picked up immediately
+    broker_cache.clear()
     return auth_obj.id
 
 def get_auth_token(name):
@@ -104,6 +108,9 @@ def upsert_api_key(user_id, api_key):
         api_key_obj = ApiKeys(user_id=user_id, api_key=api_key)
         db_session.add(api_key_obj)
     db_session.commit()
+    # A regenerated key must stop authenticating through either cached copy of the old key
+    api_key_cache[f"api-key-{user_id}"] = api_key
+    broker_cache.clear()
     return api_key_obj.id
 
 def get_api_key(user_id):
@@ -131,6 +138,10 @@ def get_api_key_dbquery(user_id):
         return None
 
 def get_auth_token_broker(provided_api_key):
+    broker_cache_key = f"broker-{provided_api_key}"
+    if broker_cache_key in broker_cache:
+        return broker_cache[broker_cache_key]
+
     # Attempt to validate the API key and get the user ID
     user_id = None
     for cache_key, api_key in api_key_cache.items():
@@ -156,7 +167,8 @@ def get_auth_token_broker(provided_api_key):
         try:
             auth_obj = Auth.query.filter_by(name=user_id).first()
             if auth_obj and not auth_obj.is_revoked:
-                # No need to cache here as it's already managed by the get_auth_token logic
+                # Cache only valid results so unknown or revoked keys are always re-checked
+                broker_cache[broker_cache_key] = (auth_obj.auth, auth_obj.broker)
                 return auth_obj.auth, auth_obj.broker  # Return the Auth object's auth token and broker
             else:
                 print(f"No valid auth token or broker found for user_id '{user_id}'.")
@@ -0,0 +1,37 @@
+# utils/json_provider.py
+
+import decimal
+import orjson
+from flask.json.provider import JSONProvider
+
+# Allow int/float dict keys, which the stdlib encoder also accepts
+ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS
+
+
+def _default(obj):
+    """
+    Fallback for types orjson does not serialize natively.
+    """
+    if isinstance(obj, decimal.Decimal):
+        return str(obj)
+    if hasattr(obj, '__html__'):
+        return str(obj.__html__())
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+class OrjsonProvider(JSONProvider):
+    """
+    JSON provider backed by orjson, used by request.get_json() and jsonify().
+    """
+
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(obj, default=_default, option=ORJSON_OPTIONS).decode('utf-8')
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        # Hand orjson's bytes straight to the response instead of going through a str
+        obj = self._prepare_response_obj(args, kwargs)
+        body = orjson.dumps(obj, default=_default, option=ORJSON_OPTIONS)
+        return self._app.response_class(body, mimetype='application/json')